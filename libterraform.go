@@ -32,6 +32,7 @@ import (
 	"path/filepath"
 	"runtime"
 	"strings"
+	"sync"
 	"unsafe"
 )
 
@@ -803,40 +804,114 @@ func convertModule(mod *configs.Module) *ShortModule {
 	return shortMod
 }
 
-//export ConfigLoadConfigDir
-func ConfigLoadConfigDir(cPath *C.char) (cMod *C.char, cDiags *C.char, cError *C.char) {
+// configDirResult is the result of loading one config directory.
+// Module is null if the directory does not exist or could not be opened.
+type configDirResult struct {
+	Module json.RawMessage
+	Diags  json.RawMessage
+	Error  string
+}
+
+func loadConfigDir(path string) (result configDirResult) {
 	defer func() {
-		recover()
+		if recover() != nil {
+			result = configDirResult{}
+		}
 	}()
 
 	parser := configs.NewParser(nil)
-	path := C.GoString(cPath)
 	mod, diags := parser.LoadConfigDir(path)
 	modBytes, err := json.Marshal(convertModule(mod))
 	if err != nil {
-		cMod = C.CString("")
-		cDiags = C.CString("")
-		cError = C.CString(err.Error())
-		return cMod, cDiags, cError
+		result.Error = err.Error()
+		return
 	}
 	diagsBytes, err := json.Marshal(diags)
 	if err != nil {
-		cMod = C.CString(string(modBytes))
-		cDiags = C.CString("")
-		cError = C.CString(err.Error())
-		return cMod, cDiags, cError
-	}
-	cMod = C.CString(string(modBytes))
-	cDiags = C.CString(string(diagsBytes))
-	cError = C.CString("")
-	return cMod, cDiags, cError
+		result.Error = err.Error()
+		return
+	}
+	result.Module = modBytes
+	result.Diags = diagsBytes
+	return
+}
+
+//export ConfigLoadConfigDir
+func ConfigLoadConfigDir(cPath *C.char) (cMod *C.char, cModLen C.size_t, cDiags *C.char, cDiagsLen C.size_t, cError *C.char, cErrorLen C.size_t) {
+	result := loadConfigDir(C.GoString(cPath))
+	if result.Module == nil && result.Error == "" {
+		// The directory does not exist or could not be opened.
+		return
+	}
+	cMod, cModLen = cBytes(result.Module)
+	cDiags, cDiagsLen = cBytes(result.Diags)
+	cError, cErrorLen = cBytes([]byte(result.Error))
+	return
+}
+
+//export ConfigLoadConfigDirs
+func ConfigLoadConfigDirs(cPaths **C.char, cCount C.int) (cResults *C.char, cResultsLen C.size_t) {
+	defer func() {
+		recover()
+	}()
+
+	slice := unsafe.Slice(cPaths, int(cCount))
+	paths := make([]string, len(slice))
+	for i, s := range slice {
+		paths[i] = C.GoString(s)
+	}
+
+	// Load the directories with a bounded number of workers, so that a long
+	// list doesn't parse every module at once.
+	workers := runtime.NumCPU()
+	if workers > len(paths) {
+		workers = len(paths)
+	}
+	results := make([]configDirResult, len(paths))
+	indexes := make(chan int)
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for i := range indexes {
+				results[i] = loadConfigDir(paths[i])
+			}
+		}()
+	}
+	for i := range paths {
+		indexes <- i
+	}
+	close(indexes)
+	wg.Wait()
+
+	resultsBytes, err := json.Marshal(results)
+	if err != nil {
+		return
+	}
+	cResults, cResultsLen = cBytes(resultsBytes)
+	return
 }
 
 // **********************************************
 // Utils
 // **********************************************
 
+// cBytes copies b into C memory, which must be released with Free, and
+// returns it with its length. Unlike C.CString it doesn't need b to be
+// converted to a string first, so large buffers are only copied once.
+func cBytes(b []byte) (*C.char, C.size_t) {
+	return (*C.char)(C.CBytes(b)), C.size_t(len(b))
+}
+
 //export Free
 func Free(cString *int) {
 	C.free(unsafe.Pointer(cString))
 }
+
+//export FreeConfigLoadConfigDirResult
+func FreeConfigLoadConfigDirResult(cMod *C.char, cDiags *C.char, cError *C.char) {
+	C.free(unsafe.Pointer(cMod))
+	C.free(unsafe.Pointer(cDiags))
+	C.free(unsafe.Pointer(cError))
+}
@@ -7,6 +7,7 @@ __version__ = "0.8.0"
 
 root = os.path.dirname(os.path.abspath(__file__))
 _lib_filename = "libterraform.dll" if WINDOWS else "libterraform.so"
+# Loaded with cdll rather than pydll, so the GIL is released while Go code runs.
 _lib_tf = cdll.LoadLibrary(os.path.join(root, _lib_filename))
 
 _free = _lib_tf.Free
@@ -1,7 +1,10 @@
 import os
+import selectors
 from ctypes import *
-from threading import Thread
-from typing import List, Sequence, Union
+from functools import lru_cache
+from threading import Lock, Thread
+from time import monotonic
+from typing import Iterator, List, Sequence, Union
 
 from libterraform import _lib_tf
 from libterraform.common import WINDOWS, CmdType, json_loads
@@ -9,21 +12,218 @@ from libterraform.exceptions import TerraformCommandError, TerraformFdReadError
 
 _run_cli = _lib_tf.RunCli
 _run_cli.argtypes = [c_int64, POINTER(c_char_p), c_int64, c_int64]
+# RunCli swaps process-wide state (os.Args, os.Stdout, the working directory
+# for -chdir), so commands issued from several threads must run one at a time.
+_run_cli_lock = Lock()
 
 
 def flag(value):
     return ... if value else None
 
 
+@lru_cache(maxsize=64)
+def _chdir_arg(chdir):
+    """Encoded -chdir argument for a str, bytes or path-like directory.
+    A TerraformCommand runs all its commands in the same directory, so this is
+    almost always a cache hit.
+    """
+    return b"-chdir=" + os.fsencode(chdir)
+
+
+@lru_cache(maxsize=256)
+def _option_flag(option):
+    """Convert a snake case option name to its flag, e.g. no_color -> -no-color."""
+    return "-" + option.replace("_", "-")
+
+
+@lru_cache(maxsize=512)
+def _encode_flag_option(option, value):
+    """Convert a flag (...) or bool option to encoded command arguments.
+
+    Most commands are called with the same few options (no_color=True,
+    input=False etc.), so the converted arguments are cached. Other values
+    are not, since options such as backend_config or var may hold secrets.
+    """
+    option = _option_flag(option)
+    if value is ...:
+        return (option.encode("utf-8"),)
+    value = "true" if value else "false"
+    return (f"{option}={value}".encode("utf-8"),)
+
+
+def _set_options(options: dict, **values):
+    """Set values into options, skipping those which are None.
+
+    Commands pass every supported option here, most of which are None by
+    default, so only the ones which are actually set reach run().
+    """
+    for option, value in values.items():
+        if value is not None:
+            options[option] = value
+
+
+def _encode_scalar_option(option, value):
+    return (f"{_option_flag(option)}={value}".encode("utf-8"),)
+
+
+def _encode_list_option(option, value):
+    option = _option_flag(option)
+    return (f"{option}={val}".encode("utf-8") for val in value)
+
+
+def _encode_dict_option(option, value):
+    option = _option_flag(option)
+    return (f"{option}={k}={v}".encode("utf-8") for k, v in value.items())
+
+
+# Option encoders by value type. Types not listed here are resolved through
+# their MRO on first use by _find_option_encoder() and then added.
+_OPTION_ENCODERS = {
+    bool: _encode_flag_option,
+    type(...): _encode_flag_option,
+    list: _encode_list_option,
+    dict: _encode_dict_option,
+}
+
+
+def _find_option_encoder(value_type):
+    for base in value_type.__mro__:
+        encoder = _OPTION_ENCODERS.get(base)
+        if encoder is not None:
+            break
+    else:
+        encoder = _encode_scalar_option
+    _OPTION_ENCODERS[value_type] = encoder
+    return encoder
+
+
+def _iter_options(options: dict) -> Iterator[bytes]:
+    """Yield encoded command arguments for options, skipping options whose
+    value is None.
+    """
+    for option, value in options.items():
+        if value is None:
+            continue
+        encoder = _OPTION_ENCODERS.get(type(value))
+        if encoder is None:
+            encoder = _find_option_encoder(type(value))
+        yield from encoder(option, value)
+
+
+# Bytes read at once from an output pipe.
+_READ_SIZE = 1 << 20
+
+
+def _memfd_supported():
+    if not hasattr(os, "memfd_create"):
+        return False
+    try:
+        os.close(os.memfd_create("libterraform-probe", os.MFD_CLOEXEC))
+    except OSError:
+        # The kernel is older than 3.17.
+        return False
+    return True
+
+
+# Output is captured with memfds on Linux (3.17+ kernels, Python 3.8+), and with
+# pipes drained by reader threads everywhere else, i.e. macOS and Windows.
+_MEMFD = _memfd_supported()
+
+
+def _read_memfd(fd) -> bytes:
+    size = os.fstat(fd).st_size
+    data = os.pread(fd, size, 0)
+    if len(data) == size:
+        return data
+    # Short read, which only happens for outputs of several GiB.
+    data = bytearray(data)
+    while len(data) < size:
+        chunk = os.pread(fd, size - len(data), len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+def _decode(data: bytes) -> str:
+    """Decode command output the same way as reading it from a text file.
+    Output which is already str, as returned by an overridden run(), is kept.
+    """
+    if isinstance(data, str):
+        return data
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+# Encoded argv of commands whose shape never changes when called with defaults,
+# so they can be run without building and encoding any options.
+_VERSION_ARGV = (b"version",)
+_VERSION_JSON_ARGV = (b"version", b"-json")
+_VALIDATE_ARGV = (b"validate", b"-no-color")
+_VALIDATE_JSON_ARGV = (b"validate", b"-no-color", b"-json")
+_PROVIDERS_ARGV = (b"providers", b"-no-color")
+_PROVIDERS_SCHEMA_ARGV = (b"providers", b"schema", b"-no-color", b"-json")
+_STATE_PULL_ARGV = (b"state", b"pull", b"-no-color")
+
+
+_UNSET = object()
+
+
 class CommandResult:
-    __slots__ = ("retcode", "value", "error", "json")
+    __slots__ = ("retcode", "_value", "_stdout", "_split", "_error", "_stderr", "json")
 
     def __init__(self, retcode, value, error=None, json=False):
         self.retcode = retcode
-        self.value = value
-        self.error = error
+        self._value = value
+        self._stdout = None
+        self._split = False
+        self._error = error
+        self._stderr = None
         self.json = json
 
+    @classmethod
+    def _from_stdout(cls, retcode, stdout, stderr, json=False, split=False):
+        """Create a result from undecoded command stdout and stderr.
+
+        They are only decoded, or loaded as json if json is True, when value and
+        error are first accessed, so callers that just check retcode don't pay
+        for it.
+        """
+        result = cls(retcode, _UNSET, _UNSET, json=json)
+        result._stdout = stdout
+        result._split = split
+        result._stderr = stderr
+        return result
+
+    @property
+    def value(self):
+        if self._value is _UNSET:
+            if self.json:
+                self._value = json_loads(self._stdout, split=self._split)
+            else:
+                self._value = _decode(self._stdout)
+            self._stdout = None
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._stdout = None
+
+    @property
+    def error(self):
+        if self._error is _UNSET:
+            self._error = _decode(self._stderr)
+            self._stderr = None
+        return self._error
+
+    @error.setter
+    def error(self, error):
+        self._error = error
+        self._stderr = None
+
     def __repr__(self):
         return f"<CommandResult retcode={self.retcode!r} json={self.json!r}>"
 
@@ -32,10 +232,22 @@ class TerraformCommand:
     """Terraform command line.
 
     https://www.terraform.io/
+
+    :param cwd: Working directory in which commands are executed, as str, bytes
+        or path-like object.
+    :param workspace_cache_ttl: Seconds for which results of successful
+        `workspace list` and `workspace show` are reused. Any other workspace
+        subcommand issued through this object clears them. Disabled by default,
+        since workspaces may also be changed by other processes.
     """
 
-    def __init__(self, cwd=None):
+    workspace_cache_ttl = None
+    # Created on first use, so that subclasses which don't call __init__() work.
+    _workspace_cache = None
+
+    def __init__(self, cwd=None, workspace_cache_ttl: float = None):
         self.cwd = cwd
+        self.workspace_cache_ttl = workspace_cache_ttl
 
     @classmethod
     def run(
@@ -74,80 +286,190 @@ class TerraformCommand:
         :param json: Whether to load stdout as json. Only partial commands support json param.
         :return: Command result tuple (retcode, stdout, stderr).
         """
+        retcode, stdout, stderr = cls._run(cmd, args, options, chdir, check, json)
+        return retcode, _decode(stdout), _decode(stderr)
+
+    @classmethod
+    def _run(
+        cls,
+        cmd: CmdType,
+        args: Sequence[str] = None,
+        options: dict = None,
+        chdir=None,
+        check: bool = False,
+        json=False,
+    ) -> (int, bytes, bytes):
+        """Same as run(), but return stdout and stderr as bytes without decoding,
+        so that json output can be loaded from them directly.
+        """
         argv = []
         if chdir:
-            argv.append(f"-chdir={chdir}")
+            argv.append(_chdir_arg(chdir))
         if isinstance(cmd, (list, tuple)):
-            argv.extend(cmd)
+            argv += [arg.encode("utf-8") for arg in cmd]
         else:
-            argv.append(cmd)
-        if json:
-            options = options if options is not None else {}
-            options.update(json=flag(json))
-        if options is not None:
-            for option, value in options.items():
-                if value is None:
-                    continue
-                if "_" in option:
-                    option = option.replace("_", "-")
-                if value is ...:
-                    argv += [f"-{option}"]
-                    continue
-                if isinstance(value, list):
-                    for val in value:
-                        argv += [f"-{option}={val}"]
-                    continue
-                if isinstance(value, dict):
-                    for k, v in value.items():
-                        argv += [f"-{option}={k}={v}"]
-                    continue
-                if isinstance(value, bool):
-                    value = "true" if value else "false"
-                argv += [f"-{option}={value}"]
+            argv.append(cmd.encode("utf-8"))
+        if options:
+            argv.extend(_iter_options(options))
+        if json and (not options or options.get("json") is None):
+            argv.append(b"-json")
         if args:
-            argv.extend(args)
+            argv.extend(arg.encode("utf-8") for arg in args)
+        return cls._run_argv(argv, check)
+
+    @classmethod
+    def _run_argv(
+        cls, argv: Sequence[bytes], check: bool = False
+    ) -> (int, bytes, bytes):
+        """Run command with already encoded argv, see _run()."""
         argc = len(argv)
-        c_argv = (c_char_p * argc)()
-        c_argv[:] = [arg.encode("utf-8") for arg in argv]
+        c_argv = (c_char_p * argc)(*argv)
+        if _MEMFD:
+            retcode, stdout, stderr = cls._run_cli_memfd(argc, c_argv)
+        else:
+            retcode, stdout, stderr = cls._run_cli_pipe(argc, c_argv)
+
+        if check and retcode not in (0, 2):
+            cmd = [os.fsdecode(arg) for arg in argv]
+            raise TerraformCommandError(retcode, cmd, _decode(stdout), _decode(stderr))
+        return retcode, stdout, stderr
+
+    def _run_fixed(self, argv: Sequence[bytes], check: bool = False):
+        """Run command with already encoded argv in the working directory."""
+        if self.cwd:
+            argv = (_chdir_arg(self.cwd), *argv)
+        return self._run_argv(argv, check)
+
+    def _run_overridden(self) -> bool:
+        """Whether run() is overridden by a subclass or patched by a test double."""
+        return getattr(self.run, "__func__", None) is not _run_func
+
+    def _run_command(
+        self,
+        cmd: CmdType,
+        args: Sequence[str] = None,
+        options: dict = None,
+        chdir=None,
+        check: bool = False,
+        json=False,
+    ):
+        """Run command for a command method, see run().
+
+        If run() is overridden, it is called so that it still sees every command.
+        Otherwise stdout and stderr are returned as bytes without decoding.
+        """
+        if self._run_overridden():
+            return self.run(
+                cmd, args, options=options, chdir=chdir, check=check, json=json
+            )
+        return self._run(cmd, args, options, chdir, check, json)
+
+    @classmethod
+    def _run_cli_pipe(cls, argc, c_argv) -> (int, bytes, bytes):
+        """Call RunCli with stdout and stderr captured through pipes, which are
+        drained by reader threads while the command runs.
+        """
         r_stdout_fd, w_stdout_fd = os.pipe()
         r_stderr_fd, w_stderr_fd = os.pipe()
 
         stdout_buffer = []
         stderr_buffer = []
-        stdout_thread = Thread(target=cls._fdread, args=(r_stdout_fd, stdout_buffer))
-        stdout_thread.daemon = True
-        stdout_thread.start()
-        stderr_thread = Thread(target=cls._fdread, args=(r_stderr_fd, stderr_buffer))
-        stderr_thread.daemon = True
-        stderr_thread.start()
+        if WINDOWS:
+            # Pipes can't be selected on Windows, so each one gets its own thread.
+            readers = [
+                Thread(target=cls._fdread, args=(r_stdout_fd, stdout_buffer)),
+                Thread(target=cls._fdread, args=(r_stderr_fd, stderr_buffer)),
+            ]
+        else:
+            readers = [
+                Thread(
+                    target=cls._fdsread,
+                    args=((r_stdout_fd, stdout_buffer), (r_stderr_fd, stderr_buffer)),
+                )
+            ]
+        for reader in readers:
+            reader.daemon = True
+            reader.start()
 
         if WINDOWS:
             import msvcrt
 
             w_stdout_handle = msvcrt.get_osfhandle(w_stdout_fd)
             w_stderr_handle = msvcrt.get_osfhandle(w_stderr_fd)
-            retcode = _run_cli(argc, c_argv, w_stdout_handle, w_stderr_handle)
+            with _run_cli_lock:
+                retcode = _run_cli(argc, c_argv, w_stdout_handle, w_stderr_handle)
         else:
-            retcode = _run_cli(argc, c_argv, w_stdout_fd, w_stderr_fd)
+            with _run_cli_lock:
+                retcode = _run_cli(argc, c_argv, w_stdout_fd, w_stderr_fd)
 
-        stdout_thread.join()
-        stderr_thread.join()
+        for reader in readers:
+            reader.join()
         if not stdout_buffer:
             raise TerraformFdReadError(fd=r_stdout_fd)
         if not stderr_buffer:
             raise TerraformFdReadError(fd=r_stderr_fd)
-        stdout = stdout_buffer[0]
-        stderr = stderr_buffer[0]
+        return retcode, stdout_buffer[0], stderr_buffer[0]
 
-        if check and retcode not in (0, 2):
-            raise TerraformCommandError(retcode, argv, stdout, stderr)
-        return retcode, stdout, stderr
+    @staticmethod
+    def _run_cli_memfd(argc, c_argv) -> (int, bytes, bytes):
+        """Call RunCli with stdout and stderr captured in anonymous memory files.
+
+        Unlike a pipe, a memory file never fills up, so no reader thread is
+        needed and the output is read back once the command returns.
+        """
+        stdout_fd = os.memfd_create("libterraform-stdout", os.MFD_CLOEXEC)
+        stderr_fd = os.memfd_create("libterraform-stderr", os.MFD_CLOEXEC)
+        try:
+            # RunCli closes the fds it is given, so hand it duplicates.
+            w_stdout_fd = os.dup(stdout_fd)
+            w_stderr_fd = os.dup(stderr_fd)
+            with _run_cli_lock:
+                retcode = _run_cli(argc, c_argv, w_stdout_fd, w_stderr_fd)
+            return retcode, _read_memfd(stdout_fd), _read_memfd(stderr_fd)
+        finally:
+            os.close(stdout_fd)
+            os.close(stderr_fd)
 
     @staticmethod
     def _fdread(std_fd, std_buffer):
-        with os.fdopen(std_fd, encoding="utf-8") as std_f:
-            std = std_f.read()
-            std_buffer.append(std)
+        std = bytearray()
+        try:
+            while True:
+                data = os.read(std_fd, _READ_SIZE)
+                if not data:
+                    break
+                std += data
+        finally:
+            os.close(std_fd)
+        std_buffer.append(bytes(std))
+
+    @staticmethod
+    def _fdsread(*std_fds):
+        """Read several fds in one thread, whichever of them is ready.
+
+        Each item of std_fds is a tuple (std_fd, std_buffer). Once std_fd reaches
+        EOF it is closed and everything read from it is appended to std_buffer.
+        """
+        with selectors.DefaultSelector() as selector:
+            for std_fd, std_buffer in std_fds:
+                selector.register(
+                    std_fd, selectors.EVENT_READ, (bytearray(), std_buffer)
+                )
+            try:
+                while selector.get_map():
+                    for key, _ in selector.select():
+                        data = os.read(key.fd, _READ_SIZE)
+                        if data:
+                            key.data[0].extend(data)
+                            continue
+                        selector.unregister(key.fd)
+                        os.close(key.fd)
+                        std, std_buffer = key.data
+                        std_buffer.append(bytes(std))
+            finally:
+                for key in list(selector.get_map().values()):
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
 
     def version(
         self, check: bool = False, json: bool = True, **options
@@ -162,11 +484,14 @@ class TerraformCommand:
         :param json: Whether to load stdout as json.
         :param options: More command options.
         """
-        retcode, stdout, stderr = self.run(
-            "version", options=options, check=check, json=json
-        )
-        value = json_loads(stdout) if json else stdout
-        return CommandResult(retcode, value, stderr, json)
+        if not options and not self._run_overridden():
+            argv = _VERSION_JSON_ARGV if json else _VERSION_ARGV
+            retcode, stdout, stderr = self._run_argv(argv, check)
+        else:
+            retcode, stdout, stderr = self._run_command(
+                "version", options=options, check=check, json=json
+            )
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
 
     def init(
         self,
@@ -247,7 +572,8 @@ class TerraformCommand:
         :param test_directory: Set the Terraform test directory, defaults to "tests".
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             backend=backend,
             backend_config=backend_config,
             force_copy=flag(force_copy),
@@ -265,10 +591,10 @@ class TerraformCommand:
             ignore_remote_version=flag(ignore_remote_version),
             test_directory=test_directory,
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "init", options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def validate(
         self,
@@ -312,16 +638,26 @@ class TerraformCommand:
         :param test_directory: Set the Terraform test directory, defaults to "tests".
         :param options: More command options.
         """
-        options.update(
+        if (
+            no_color
+            and not no_test
+            and test_directory is None
+            and not options
+            and not self._run_overridden()
+        ):
+            argv = _VALIDATE_JSON_ARGV if json else _VALIDATE_ARGV
+            retcode, stdout, stderr = self._run_fixed(argv, check)
+            return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
+        _set_options(
+            options,
             no_color=flag(no_color),
             no_test=flag(no_test),
             test_directory=test_directory,
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "validate", options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
 
     def plan(
         self,
@@ -409,7 +745,8 @@ class TerraformCommand:
             local backend's documentation for more information.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             destroy=flag(destroy),
             refresh_only=flag(refresh_only),
             refresh=refresh,
@@ -428,11 +765,12 @@ class TerraformCommand:
             parallelism=parallelism,
             state=state,
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "plan", options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout, split=True) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(
+            retcode, stdout, stderr, json=json, split=True
+        )
 
     def show(
         self,
@@ -455,15 +793,15 @@ class TerraformCommand:
         :param no_color: True to output not contain any color.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
         )
         args = [path] if path else None
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "show", args, options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
 
     def apply(
         self,
@@ -526,7 +864,8 @@ class TerraformCommand:
             instead of the usual behavior.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             auto_approve=flag(auto_approve),
             backup=backup,
             compact_warnings=flag(compact_warnings),
@@ -540,11 +879,12 @@ class TerraformCommand:
             destroy=flag(destroy),
         )
         args = [plan] if plan else None
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "apply", args, options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout, split=True) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(
+            retcode, stdout, stderr, json=json, split=True
+        )
 
     def destroy(
         self,
@@ -598,7 +938,8 @@ class TerraformCommand:
             This can be used to preserve the old state.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             auto_approve=flag(auto_approve),
             backup=backup,
             compact_warnings=flag(compact_warnings),
@@ -610,11 +951,12 @@ class TerraformCommand:
             state=state,
             state_out=state_out,
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "destroy", options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout, split=True) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(
+            retcode, stdout, stderr, json=json, split=True
+        )
 
     def fmt(
         self,
@@ -659,7 +1001,8 @@ class TerraformCommand:
             given directory (or current directory) is processed.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
             list=list,
             write=write,
@@ -673,10 +1016,10 @@ class TerraformCommand:
                 args = [dir]
         else:
             args = None
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "fmt", args, options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr, json=False)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def force_unlock(
         self,
@@ -701,15 +1044,16 @@ class TerraformCommand:
         :param force: True to not ask for input for unlock confirmation.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
             force=flag(force),
         )
         args = [lock_id]
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "force-unlock", args, options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr, json=False)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def get(
         self,
@@ -740,15 +1084,16 @@ class TerraformCommand:
         :param test_directory: Set the Terraform test directory, defaults to "tests".
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
             update=flag(update),
             test_directory=test_directory,
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "get", options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr, json=False)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def graph(
         self,
@@ -790,16 +1135,17 @@ class TerraformCommand:
             but therefore often harder to read.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
             plan=plan,
             draw_cycles=flag(draw_cycles),
             type=type,
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "graph", options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr, json=False)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def import_resource(
         self,
@@ -865,7 +1211,8 @@ class TerraformCommand:
             See the remote backend documentation for more information.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             config=config,
             input=input,
             lock=lock,
@@ -876,10 +1223,10 @@ class TerraformCommand:
             ignore_remote_version=flag(ignore_remote_version),
         )
         args = [addr, id]
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "import", args, options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr, json=False)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def output(
         self,
@@ -909,17 +1256,17 @@ class TerraformCommand:
             representation of the value.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
             state=state,
             raw=flag(raw),
         )
         args = [name] if name else None
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "output", args, options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
 
     def providers(
         self,
@@ -948,18 +1295,26 @@ class TerraformCommand:
         :param test_directory: Set the Terraform test directory, defaults to "tests".
         :param options: More command options.
         """
-        options.update(
+        if (
+            no_color
+            and not (subcmd or args or json or options)
+            and test_directory is None
+            and not self._run_overridden()
+        ):
+            retcode, stdout, stderr = self._run_fixed(_PROVIDERS_ARGV, check)
+            return CommandResult._from_stdout(retcode, stdout, stderr)
+        _set_options(
+            options,
             no_color=flag(no_color),
             test_directory=test_directory,
         )
         cmd = ["providers"]
         if subcmd:
             cmd.append(subcmd)
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             cmd, args=args, options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
 
     def providers_lock(
         self,
@@ -1018,15 +1373,22 @@ class TerraformCommand:
             wont be loaded from an authoritative source.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
+            no_color=flag(no_color),
             fs_mirror=fs_mirror,
             net_mirror=net_mirror,
             platform=platform,
             enable_plugin_cache=flag(enable_plugin_cache),
         )
-        return self.providers(
-            subcmd="lock", args=providers, check=check, no_color=no_color, **options
+        retcode, stdout, stderr = self._run_command(
+            ["providers", "lock"],
+            providers,
+            options=options,
+            chdir=self.cwd,
+            check=check,
         )
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def providers_mirror(
         self,
@@ -1061,13 +1423,16 @@ class TerraformCommand:
             set of target platforms.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
+            no_color=flag(no_color),
             platform=platform,
         )
         args = [target_dir]
-        return self.providers(
-            subcmd="mirror", args=args, check=check, no_color=no_color, **options
+        retcode, stdout, stderr = self._run_command(
+            ["providers", "mirror"], args, options=options, chdir=self.cwd, check=check
         )
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def providers_schema(
         self,
@@ -1084,9 +1449,21 @@ class TerraformCommand:
         :param no_color: True to output not contain any color.
         :param options: More command options.
         """
-        return self.providers(
-            subcmd="schema", check=check, no_color=no_color, json=True, **options
-        )
+        if no_color and not options and not self._run_overridden():
+            retcode, stdout, stderr = self._run_fixed(_PROVIDERS_SCHEMA_ARGV, check)
+        else:
+            _set_options(
+                options,
+                no_color=flag(no_color),
+            )
+            retcode, stdout, stderr = self._run_command(
+                ["providers", "schema"],
+                options=options,
+                chdir=self.cwd,
+                check=check,
+                json=True,
+            )
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=True)
 
     def refresh(
         self,
@@ -1132,7 +1509,8 @@ class TerraformCommand:
         :param parallelism: Limit the number of concurrent operations. Defaults to 10.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             target=target,
             var=vars,
             var_file=var_files,
@@ -1143,11 +1521,12 @@ class TerraformCommand:
             no_color=flag(no_color),
             parallelism=parallelism,
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "refresh", options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout, split=True) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(
+            retcode, stdout, stderr, json=json, split=True
+        )
 
     def state(
         self,
@@ -1178,15 +1557,15 @@ class TerraformCommand:
         :param json: Whether to load stdout as json.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
         )
         cmd = ["state", subcmd]
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             cmd, args=args, options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
 
     def state_list(
         self,
@@ -1222,7 +1601,7 @@ class TerraformCommand:
             the given ids.
         :param options: More command options.
         """
-        options.update(id=ids)
+        _set_options(options, id=ids)
         return self.state(
             "list", args=addrs, check=check, no_color=no_color, state=state, **options
         )
@@ -1271,7 +1650,8 @@ class TerraformCommand:
             the remote backend documentation for more information.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             dry_run=flag(dry_run),
             lock=lock,
             lock_timeout=lock_timeout,
@@ -1300,16 +1680,19 @@ class TerraformCommand:
         :param no_color: True to output not contain any color.
         :param options: More command options.
         """
-        options.update(
-            no_color=flag(no_color),
-        )
-        cmd = ["state", "pull"]
-        retcode, stdout, stderr = self.run(
-            cmd, options=options, chdir=self.cwd, check=check
-        )
+        if no_color and not options and not self._run_overridden():
+            retcode, stdout, stderr = self._run_fixed(_STATE_PULL_ARGV, check)
+        else:
+            _set_options(
+                options,
+                no_color=flag(no_color),
+            )
+            cmd = ["state", "pull"]
+            retcode, stdout, stderr = self._run_command(
+                cmd, options=options, chdir=self.cwd, check=check
+            )
         json = retcode == 0
-        value = json_loads(stdout) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(retcode, stdout, stderr, json=json)
 
     def state_push(
         self,
@@ -1345,7 +1728,8 @@ class TerraformCommand:
         :param lock_timeout: Duration to retry a state lock.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             force=flag(force),
             lock=lock,
             lock_timeout=lock_timeout,
@@ -1383,7 +1767,8 @@ class TerraformCommand:
             the remote backend documentation for more information.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             lock=lock,
             lock_timeout=lock_timeout,
             auto_approve=flag(auto_approve),
@@ -1442,7 +1827,8 @@ class TerraformCommand:
             and should be used with extreme caution.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             dry_run=flag(dry_run),
             backup=backup,
             lock=lock,
@@ -1475,7 +1861,8 @@ class TerraformCommand:
             workspace state.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             state=state,
         )
         return self.state(
@@ -1529,17 +1916,18 @@ class TerraformCommand:
             the remote backend documentation for more information.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
             allow_missing_config=flag(allow_missing_config),
             lock=lock,
             lock_timeout=lock_timeout,
             ignore_remote_version=flag(ignore_remote_version),
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "taint", args=[addr], options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def untaint(
         self,
@@ -1579,17 +1967,18 @@ class TerraformCommand:
             the remote backend documentation for more information.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             no_color=flag(no_color),
             allow_missing_config=flag(allow_missing_config),
             lock=lock,
             lock_timeout=lock_timeout,
             ignore_remote_version=flag(ignore_remote_version),
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "untaint", args=[addr], options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr)
+        return CommandResult._from_stdout(retcode, stdout, stderr)
 
     def test(
         self,
@@ -1638,7 +2027,8 @@ class TerraformCommand:
             executes.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             var=vars,
             var_file=var_files,
             no_color=flag(no_color),
@@ -1647,11 +2037,12 @@ class TerraformCommand:
             test_directory=test_directory,
             verbose=flag(verbose),
         )
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             "test", options=options, chdir=self.cwd, check=check, json=json
         )
-        value = json_loads(stdout, split=True) if json else stdout
-        return CommandResult(retcode, value, stderr, json=json)
+        return CommandResult._from_stdout(
+            retcode, stdout, stderr, json=json, split=True
+        )
 
     def workspace(
         self,
@@ -1665,20 +2056,37 @@ class TerraformCommand:
 
         new, list, show, select and delete Terraform workspaces.
 
-        :param subcmd: Sub commands: list, mv, pull, push, replace-provider, rm and show.
+        :param subcmd: Sub commands: new, list, show, select and delete.
         :param args: Args for command.
         :param check: Whether to check return code.
         :param no_color: True to output not contain any color.
         :param options: More command options.
         """
-        options.update(
+        cache_key = None
+        if subcmd not in ("list", "show"):
+            if self._workspace_cache:
+                self._workspace_cache.clear()
+        elif self.workspace_cache_ttl and not args and not options:
+            cache_key = (self.cwd, subcmd, no_color)
+            if self._workspace_cache is None:
+                self._workspace_cache = {}
+            cached = self._workspace_cache.get(cache_key)
+            if cached is not None and monotonic() < cached[0]:
+                return cached[1]
+
+        _set_options(
+            options,
             no_color=flag(no_color),
         )
         cmd = ["workspace", subcmd]
-        retcode, stdout, stderr = self.run(
+        retcode, stdout, stderr = self._run_command(
             cmd, args=args, options=options, chdir=self.cwd, check=check
         )
-        return CommandResult(retcode, stdout, stderr)
+        result = CommandResult._from_stdout(retcode, stdout, stderr)
+        if cache_key is not None and retcode == 0:
+            expires = monotonic() + self.workspace_cache_ttl
+            self._workspace_cache[cache_key] = (expires, result)
+        return result
 
     def workspace_new(
         self,
@@ -1704,7 +2112,8 @@ class TerraformCommand:
         :param state: Copy an existing state file into the new workspace.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             lock=lock,
             lock_timeout=lock_timeout,
         )
@@ -1788,7 +2197,8 @@ class TerraformCommand:
         :param lock_timeout: Duration to retry a state lock.
         :param options: More command options.
         """
-        options.update(
+        _set_options(
+            options,
             force=flag(force),
             lock=lock,
             lock_timeout=lock_timeout,
@@ -1796,3 +2206,6 @@ class TerraformCommand:
         return self.workspace(
             "delete", args=[name], check=check, no_color=no_color, **options
         )
+
+
+_run_func = TerraformCommand.__dict__["run"].__func__
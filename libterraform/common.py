@@ -19,14 +19,32 @@ CmdType = Union[str, List]
 # utils
 # ===================================================================
 
+_loads = json.loads
+
+
+def use_orjson(enabled: bool = True):
+    """Load json output with orjson instead of the json module, which is
+    considerably faster for large outputs. orjson must be installed.
+
+    Unlike the json module, orjson loads integers that don't fit in 64 bits as
+    floats, so such numbers in outputs or state lose precision.
+    """
+    global _loads
+    if enabled:
+        from orjson import loads as _loads
+    else:
+        _loads = json.loads
+
 
 def json_loads(string, split=False):
+    """Load json from str or bytes, with orjson if use_orjson() was called.
+
+    If split is True, string is regarded as json lines and a list is returned.
+    """
     if split:
-        value = []
-        for line in string.split("\n"):
-            if not line:
-                continue
-            value.append(json.loads(line))
-    else:
-        value = json.loads(string)
-    return value
+        if isinstance(string, str):
+            # str.splitlines() also splits on characters which json strings
+            # may contain unescaped, such as U+0085, but bytes.splitlines() doesn't.
+            string = string.encode("utf-8")
+        return [_loads(line) for line in string.splitlines() if line]
+    return _loads(string)
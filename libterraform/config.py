@@ -1,44 +1,182 @@
-import json
+import os
+from collections import OrderedDict
 from ctypes import *
+from threading import Lock
+from typing import List, Sequence, Tuple, Union
 
 from libterraform import _free, _lib_tf
+from libterraform.common import json_loads
 from libterraform.exceptions import LibTerraformError
 
 
 class LoadConfigDirResult(Structure):
-    _fields_ = [("r0", c_void_p), ("r1", c_void_p), ("r2", c_void_p)]
+    _fields_ = [
+        ("r0", c_void_p),
+        ("r1", c_size_t),
+        ("r2", c_void_p),
+        ("r3", c_size_t),
+        ("r4", c_void_p),
+        ("r5", c_size_t),
+    ]
 
 
 _load_config_dir = _lib_tf.ConfigLoadConfigDir
 _load_config_dir.argtypes = [c_char_p]
 _load_config_dir.restype = LoadConfigDirResult
 
+_free_load_config_dir_result = _lib_tf.FreeConfigLoadConfigDirResult
+_free_load_config_dir_result.argtypes = [c_void_p, c_void_p, c_void_p]
+
+
+class LoadConfigDirsResult(Structure):
+    _fields_ = [("r0", c_void_p), ("r1", c_size_t)]
+
+
+_load_config_dirs = _lib_tf.ConfigLoadConfigDirs
+_load_config_dirs.argtypes = [POINTER(c_char_p), c_int]
+_load_config_dirs.restype = LoadConfigDirsResult
+
+
+def _string_at(ptr, size):
+    """Copy the buffer of the given size returned by Go into bytes, or None for NULL."""
+    return string_at(ptr, size) if ptr else None
+
+
+def _no_such_dir_error(path):
+    msg = f"The given directory {os.fsdecode(path)!r} does not exist at all or could not be opened for some reason."
+    return LibTerraformError(msg)
+
+
+def _load_config_dir_raw(path):
+    """Load the config dir at the encoded path and return the undecoded module
+    and diagnostics json.
+    """
+    ret = _load_config_dir(path)
+    r_mod = _string_at(ret.r0, ret.r1)
+    r_diags = _string_at(ret.r2, ret.r3)
+    err = _string_at(ret.r4, ret.r5)
+    _free_load_config_dir_result(ret.r0, ret.r2, ret.r4)
+
+    if err:
+        raise LibTerraformError(err)
+    if r_mod is None:
+        raise _no_such_dir_error(path)
+    return r_mod, r_diags
+
+
+def _load_diags(r_diags):
+    # Diagnostics are empty for most valid configurations, which doesn't need
+    # the json loader.
+    if r_diags == b"null":
+        return None
+    if r_diags == b"[]":
+        return []
+    return json_loads(r_diags)
+
+
+# Undecoded results of load_config_dir(cache=True), keyed by _config_dir_key(),
+# least recently used first.
+_CONFIG_DIR_CACHE_SIZE = 128
+_config_dir_cache = OrderedDict()
+_config_dir_cache_lock = Lock()
+
+
+def _config_dir_key(path):
+    """Return a key built from the name, inode, size, mtime and ctime of every
+    .tf and .tf.json file in path, or None if path can't be listed.
+    """
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return None
+    files = []
+    with entries:
+        for entry in entries:
+            if entry.name.endswith((b".tf", b".tf.json")) and entry.is_file():
+                stat = entry.stat()
+                files.append(
+                    (
+                        entry.name,
+                        entry.inode(),
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        stat.st_ctime_ns,
+                    )
+                )
+    files.sort()
+    return os.path.abspath(path), tuple(files)
+
+
+def _load_config_dir_cached(path):
+    key = _config_dir_key(path)
+    if key is None:
+        return _load_config_dir_raw(path)
+    with _config_dir_cache_lock:
+        raw = _config_dir_cache.get(key)
+        if raw is not None:
+            _config_dir_cache.move_to_end(key)
+            return raw
+    raw = _load_config_dir_raw(path)
+    with _config_dir_cache_lock:
+        _config_dir_cache[key] = raw
+        if len(_config_dir_cache) > _CONFIG_DIR_CACHE_SIZE:
+            _config_dir_cache.popitem(last=False)
+    return raw
+
 
 class TerraformConfig:
     @staticmethod
-    def load_config_dir(path: str) -> (dict, dict):
+    def load_config_dir(
+        path: Union[str, bytes, os.PathLike], cache: bool = False
+    ) -> (dict, dict):
         """
         load_config_dir reads the .tf and .tf.json files in the given directory
         as config files and then combines these files into a single Module.
 
         .tf files are parsed using the HCL native syntax while .tf.json files are
         parsed using the HCL JSON syntax.
-        """
-        ret = _load_config_dir(path.encode("utf-8"))
-        r_mod = cast(ret.r0, c_char_p).value
-        _free(ret.r0)
-        r_diags = cast(ret.r1, c_char_p).value
-        _free(ret.r1)
-        err = cast(ret.r2, c_char_p).value
-        _free(ret.r2)
 
-        if err:
-            raise LibTerraformError(err)
-        if r_mod is None:
-            msg = f"The given directory {path!r} does not exist at all or could not be opened for some reason."
-            raise LibTerraformError(msg)
+        If cache is True, the result is cached and reused as long as no .tf or
+        .tf.json file in the directory is added, removed or replaced, and none
+        changes size, mtime or ctime. A rewrite that keeps the size within the
+        filesystem's timestamp resolution is not detected. Each call still
+        returns new dicts.
+        """
+        path = os.fsencode(path)
+        if cache:
+            r_mod, r_diags = _load_config_dir_cached(path)
+        else:
+            r_mod, r_diags = _load_config_dir_raw(path)
 
-        mod = json.loads(r_mod)
-        diags = json.loads(r_diags)
+        mod = json_loads(r_mod)
+        diags = _load_diags(r_diags)
 
         return mod, diags
+
+    @staticmethod
+    def load_config_dirs(
+        paths: Sequence[Union[str, bytes, os.PathLike]],
+    ) -> List[Tuple[dict, dict]]:
+        """
+        load_config_dirs is the same as load_config_dir, but loads all the given
+        directories with a single call, which parses them concurrently.
+
+        A list of (mod, diags) is returned in the same order as paths.
+        """
+        paths = [os.fsencode(path) for path in paths]
+        c_paths = (c_char_p * len(paths))(*paths)
+        ret = _load_config_dirs(c_paths, len(paths))
+        r_results = _string_at(ret.r0, ret.r1)
+        _free(ret.r0)
+
+        if r_results is None:
+            raise LibTerraformError("Failed to load the given directories.")
+
+        results = []
+        for path, result in zip(paths, json_loads(r_results)):
+            if result["Error"]:
+                raise LibTerraformError(result["Error"])
+            if result["Module"] is None:
+                raise _no_such_dir_error(path)
+            results.append((result["Module"], result["Diags"]))
+        return results
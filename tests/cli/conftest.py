@@ -1,17 +1,64 @@
 import os
+import shutil
 
 import pytest
 
 from libterraform import TerraformCommand
-from tests.consts import TF_SLEEP_DIR
+from tests.consts import TF_SLEEP2_DIR, TF_SLEEP_DIR
 
 
-@pytest.fixture(scope="package")
-def cli():
-    cwd = TF_SLEEP_DIR
-    tf = os.path.join(cwd, ".terraform")
+def _init_cli(cwd, tmp_path_factory):
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        # Give each pytest-xdist worker its own copy of the configuration,
+        # so that workers don't share .terraform and terraform.tfstate.
+        name = os.path.basename(cwd)
+        cwd = shutil.copytree(
+            cwd, str(tmp_path_factory.mktemp(name) / name), symlinks=True
+        )
+    providers = os.path.join(cwd, ".terraform", "providers")
 
     cli = TerraformCommand(cwd)
-    if not os.path.exists(tf):
+    if not os.path.exists(providers):
         cli.init()
     return cli
+
+
+@pytest.fixture(scope="session")
+def cli(tmp_path_factory):
+    return _init_cli(TF_SLEEP_DIR, tmp_path_factory)
+
+
+@pytest.fixture(scope="session")
+def cli2(tmp_path_factory):
+    return _init_cli(TF_SLEEP2_DIR, tmp_path_factory)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "mutates_state: the test changes the state of the cli fixture"
+    )
+
+
+@pytest.fixture(scope="session")
+def _cli_state():
+    return {"applied": False}
+
+
+@pytest.fixture(autouse=True)
+def _track_cli_state(request, _cli_state):
+    yield
+    if request.node.get_closest_marker("mutates_state"):
+        _cli_state["applied"] = False
+
+
+@pytest.fixture
+def applied_cli(cli, _cli_state):
+    """The cli fixture with its configuration applied.
+
+    apply() only runs again after a test marked with mutates_state.
+    """
+    if not _cli_state["applied"]:
+        r = cli.apply()
+        assert r.retcode == 0, r.error
+        _cli_state["applied"] = True
+    return cli
@@ -1,8 +1,10 @@
+import pytest
+
 from libterraform import TerraformCommand
 
 
 class TestTerraformCommandApply:
-    def test_destroy(self, cli: TerraformCommand):
-        cli.apply()
-        r = cli.destroy()
+    @pytest.mark.mutates_state
+    def test_destroy(self, applied_cli: TerraformCommand):
+        r = applied_cli.destroy()
         assert r.retcode == 0, r.error
@@ -1,7 +1,10 @@
+import pytest
+
 from libterraform import TerraformCommand
 
 
 class TestTerraformCommandImport:
+    @pytest.mark.mutates_state
     def test_import(self, cli: TerraformCommand):
         cli.destroy()
         try:
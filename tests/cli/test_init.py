@@ -1,8 +1,7 @@
 from libterraform import TerraformCommand
-from tests.consts import TF_SLEEP_DIR
 
 
 class TestTerraformCommandInit:
-    def test_init(self):
-        r = TerraformCommand(TF_SLEEP_DIR).init()
+    def test_init(self, cli: TerraformCommand):
+        r = TerraformCommand(cli.cwd).init()
         assert r.retcode == 0, r.error
@@ -8,10 +8,9 @@ class TestTerraformCommandProviders:
         r = cli.providers()
         assert r.retcode == 0, r.error
 
-    def test_providers_lock(self, cli: TerraformCommand):
-        cli.apply()
-        r = cli.providers_lock(
-            fs_mirror=os.path.join(cli.cwd, ".terraform", "providers"),
+    def test_providers_lock(self, applied_cli: TerraformCommand):
+        r = applied_cli.providers_lock(
+            fs_mirror=os.path.join(applied_cli.cwd, ".terraform", "providers"),
             enable_plugin_cache=True,
         )
         assert r.retcode == 0, r.error
@@ -17,3 +17,17 @@ class TestTerraformCommandRun:
 
         with pytest.raises(TerraformCommandError):
             TerraformCommand.run("invalid", check=True)
+
+    def test_run_overridden(self, cli: TerraformCommand):
+        cmds = []
+
+        class RecordingCommand(TerraformCommand):
+            @classmethod
+            def run(cls, cmd, *args, **kwargs):
+                cmds.append(cmd)
+                return super().run(cmd, *args, **kwargs)
+
+        r = RecordingCommand(cli.cwd).validate()
+        assert r.retcode == 0, r.error
+        assert r.value["valid"]
+        assert cmds == ["validate"]
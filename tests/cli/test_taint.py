@@ -1,10 +1,12 @@
+import pytest
+
 from libterraform import TerraformCommand
 
 
 class TestTerraformCommandTaint:
-    def test_taint(self, cli: TerraformCommand):
-        cli.apply()
-        r = cli.taint("time_sleep.wait1")
+    @pytest.mark.mutates_state
+    def test_taint(self, applied_cli: TerraformCommand):
+        r = applied_cli.taint("time_sleep.wait1")
         assert r.retcode == 0, r.error
         assert "time_sleep.wait1" in r.value
 
@@ -1,7 +1,4 @@
-import os.path
-
 from libterraform import TerraformCommand
-from tests.consts import TF_SLEEP2_DIR
 
 
 class TestTerraformCommandTest:
@@ -11,24 +8,12 @@ class TestTerraformCommandTest:
         assert "Success! 0 passed, 0 failed." in r.value
         assert not r.error
 
-    def test_test_run(self):
-        cwd = TF_SLEEP2_DIR
-        tf = os.path.join(cwd, ".terraform")
-
-        cli = TerraformCommand(cwd)
-        if not os.path.exists(tf):
-            cli.init()
-        r = cli.test()
+    def test_test_run(self, cli2: TerraformCommand):
+        r = cli2.test()
         assert r.retcode == 0, r.error
         assert r.value[-1]["test_summary"]["status"] == "pass"
 
-    def test_test_assertion_error(self):
-        cwd = TF_SLEEP2_DIR
-        tf = os.path.join(cwd, ".terraform")
-
-        cli = TerraformCommand(cwd)
-        if not os.path.exists(tf):
-            cli.init()
-        r = cli.test(vars={"sleep2_time1": "2s"})
+    def test_test_assertion_error(self, cli2: TerraformCommand):
+        r = cli2.test(vars={"sleep2_time1": "2s"})
         assert r.retcode == 1
         assert r.value[-1]["test_summary"]["status"] == "fail"
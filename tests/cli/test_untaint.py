@@ -1,12 +1,14 @@
+import pytest
+
 from libterraform import TerraformCommand
 
 
 class TestTerraformCommandUnTaint:
-    def test_untaint(self, cli: TerraformCommand):
-        cli.apply()
+    @pytest.mark.mutates_state
+    def test_untaint(self, applied_cli: TerraformCommand):
         addr = "time_sleep.wait1"
-        cli.taint(addr)
-        r = cli.taint(addr)
+        applied_cli.taint(addr)
+        r = applied_cli.taint(addr)
         assert r.retcode == 0, r.error
         assert "time_sleep.wait1" in r.value
 
@@ -1,3 +1,5 @@
+import os
+
 from libterraform import TerraformCommand
 
 
@@ -12,3 +14,8 @@ class TestTerraformCommandValidate:
             "warning_count": 0,
             "diagnostics": [],
         }
+
+    def test_validate_bytes_cwd(self, cli: TerraformCommand):
+        r = TerraformCommand(os.fsencode(cli.cwd)).validate()
+        assert r.retcode == 0, r.error
+        assert r.value["valid"]
@@ -23,3 +23,34 @@ class TestTerraformCommandWorkSpace:
 
         r = cli.workspace_delete(name)
         assert r.retcode == 0, r.error
+
+    def test_workspace_cache(self, cli: TerraformCommand):
+        cached_cli = TerraformCommand(cli.cwd, workspace_cache_ttl=60)
+        r = cached_cli.workspace_show()
+        assert r.retcode == 0, r.error
+        assert cached_cli.workspace_show() is r
+
+        name = "test_cache"
+        r = cached_cli.workspace_new(name)
+        assert r.retcode == 0, r.error
+        r = cached_cli.workspace_show()
+        assert r.retcode == 0, r.error
+        assert name in r.value
+
+        r = cached_cli.workspace_select("default")
+        assert r.retcode == 0, r.error
+        r = cached_cli.workspace_delete(name)
+        assert r.retcode == 0, r.error
+        assert name not in cached_cli.workspace_list().value
+
+    def test_workspace_subclass_without_init(self, cli: TerraformCommand):
+        class Command(TerraformCommand):
+            def __init__(self, cwd):
+                self.cwd = cwd
+
+        command = Command(cli.cwd)
+        r = command.workspace_list()
+        assert r.retcode == 0, r.error
+        assert "default" in r.value
+        r = command.workspace_select("default")
+        assert r.retcode == 0, r.error
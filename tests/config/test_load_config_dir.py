@@ -1,8 +1,12 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from libterraform import TerraformConfig
 from libterraform.exceptions import LibTerraformError
-from tests.consts import TF_SLEEP_DIR
+from tests.consts import TF_SLEEP2_DIR, TF_SLEEP_DIR
 
 
 class TestTerraformConfig:
@@ -11,6 +15,76 @@ class TestTerraformConfig:
         assert "time_sleep.wait1" in mod["ManagedResources"]
         assert "time_sleep.wait2" in mod["ManagedResources"]
 
+    def test_load_config_dir_bytes_path(self):
+        mod, diags = TerraformConfig.load_config_dir(os.fsencode(TF_SLEEP_DIR))
+        assert "time_sleep.wait1" in mod["ManagedResources"]
+
     def test_load_config_dir_no_exits(self):
         with pytest.raises(LibTerraformError):
             TerraformConfig.load_config_dir("not-exits")
+
+    def test_load_config_dir_cache(self):
+        mod1, diags1 = TerraformConfig.load_config_dir(TF_SLEEP_DIR, cache=True)
+        mod2, diags2 = TerraformConfig.load_config_dir(TF_SLEEP_DIR, cache=True)
+        assert mod1 == mod2
+        assert diags1 == diags2
+        assert mod1 is not mod2
+
+    def test_load_config_dir_cache_invalidation(self, tmp_path):
+        path = str(tmp_path / "sleep")
+        shutil.copytree(
+            TF_SLEEP_DIR,
+            path,
+            ignore=shutil.ignore_patterns(".terraform*", "*.tfstate*"),
+        )
+        main_tf = os.path.join(path, "main.tf")
+
+        def resources():
+            mod, _ = TerraformConfig.load_config_dir(path, cache=True)
+            return mod["ManagedResources"]
+
+        assert "time_sleep.wait1" in resources()
+
+        # Edit a resource in place.
+        with open(main_tf) as f:
+            content = f.read()
+        with open(main_tf, "w") as f:
+            f.write(content.replace('"wait1" {', '"wait1_edited" {'))
+        assert "time_sleep.wait1_edited" in resources()
+        assert "time_sleep.wait1" not in resources()
+
+        # Add a new file.
+        with open(os.path.join(path, "extra.tf"), "w") as f:
+            f.write('resource "time_sleep" "wait3" {\n  create_duration = "1s"\n}\n')
+        assert "time_sleep.wait3" in resources()
+
+        # Replace a file via rename, keeping its size.
+        with open(main_tf) as f:
+            content = f.read()
+        with open(main_tf + ".new", "w") as f:
+            f.write(content.replace('"wait2" {', '"wait9" {'))
+        os.replace(main_tf + ".new", main_tf)
+        assert "time_sleep.wait9" in resources()
+        assert "time_sleep.wait2" not in resources()
+
+    def test_load_config_dir_cache_no_exits(self):
+        with pytest.raises(LibTerraformError):
+            TerraformConfig.load_config_dir("not-exits", cache=True)
+
+    def test_load_config_dir_threads(self):
+        expected = TerraformConfig.load_config_dir(TF_SLEEP_DIR)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(TerraformConfig.load_config_dir, [TF_SLEEP_DIR] * 8)
+            )
+        assert all(result == expected for result in results)
+
+    def test_load_config_dirs(self):
+        results = TerraformConfig.load_config_dirs([TF_SLEEP_DIR, TF_SLEEP2_DIR])
+        assert len(results) == 2
+        for path, (mod, diags) in zip([TF_SLEEP_DIR, TF_SLEEP2_DIR], results):
+            assert (mod, diags) == TerraformConfig.load_config_dir(path)
+
+    def test_load_config_dirs_no_exits(self):
+        with pytest.raises(LibTerraformError):
+            TerraformConfig.load_config_dirs([TF_SLEEP_DIR, "not-exits"])
@@ -1,6 +1,6 @@
 import os
 
-ROOT = os.path.dirname(__file__)
+ROOT = os.path.dirname(os.path.abspath(__file__))
 TF_DIR = os.path.join(ROOT, "tf")
 TF_SLEEP_DIR = os.path.join(TF_DIR, "sleep")
 TF_SLEEP2_DIR = os.path.join(TF_DIR, "sleep2")
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from libterraform import common
+from libterraform.common import json_loads, use_orjson
+
+
+@pytest.fixture(autouse=True)
+def default_loader():
+    yield
+    use_orjson(False)
+
+
+class TestJsonLoads:
+    def test_use_orjson(self):
+        orjson = pytest.importorskip("orjson")
+        assert common._loads is json.loads
+        use_orjson()
+        assert common._loads is orjson.loads
+        assert json_loads(b'{"a": 1}') == {"a": 1}
+        use_orjson(False)
+        assert common._loads is json.loads
+
+    def test_json_loads_split_bytes(self):
+        value = json_loads(b'{"a": 1}\r\n\r\n{"b": 2}\n\n', split=True)
+        assert value == [{"a": 1}, {"b": 2}]
+
+    def test_json_loads_split_str_with_next_line(self):
+        value = json_loads('{"a": "x\u0085y"}\n{"b": 2}\n', split=True)
+        assert value == [{"a": "x\u0085y"}, {"b": 2}]